@@ -111,7 +111,9 @@ class ExportCommand(GroupCommand):
             )
             return 1
 
-        if self.option("extras") and self.option("all-extras"):
+        extra_options = self.option("extras")
+        all_extras = self.option("all-extras")
+        if extra_options and all_extras:
             self.line_error(
                 "<error>You cannot specify explicit"
                 " `<fg=yellow;options=bold>--extras</>` while exporting"
@@ -120,12 +122,12 @@ class ExportCommand(GroupCommand):
             return 1
 
         extras: Iterable[NormalizedName]
-        if self.option("all-extras"):
+        if all_extras:
             extras = self.poetry.package.extras.keys()
         else:
             extras = {
                 canonicalize_name(extra)
-                for extra_opt in self.option("extras")
+                for extra_opt in extra_options
                 for extra in extra_opt.split()
             }
             invalid_extras = extras - self.poetry.package.extras.keys()
@@ -134,9 +136,10 @@ class ExportCommand(GroupCommand):
                     f"Extra [{', '.join(sorted(invalid_extras))}] is not specified."
                 )
 
-        if (
+        all_groups = self.option("all-groups")
+        if all_groups and (
             self.option("with") or self.option("without") or self.option("only")
-        ) and self.option("all-groups"):
+        ):
             self.line_error(
                 "<error>You cannot specify explicit"
                 " `<fg=yellow;options=bold>--with</>`, "
@@ -148,7 +151,7 @@ class ExportCommand(GroupCommand):
 
         groups = (
             self.poetry.package.dependency_group_names(include_optional=True)
-            if self.option("all-groups")
+            if all_groups
             else self.activated_groups
         )
 
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import urllib.parse
-
 from functools import partialmethod
 from typing import TYPE_CHECKING
 
 from cleo.io.io import IO
 from poetry.core.packages.dependency_group import MAIN_GROUP
 from poetry.core.packages.utils.utils import create_nested_marker
+from poetry.core.packages.utils.utils import path_to_url
 from poetry.core.version.markers import parse_marker
 from poetry.repositories.http_repository import HTTPRepository
 
@@ -22,6 +21,7 @@ if TYPE_CHECKING:
     from typing import ClassVar
 
     from packaging.utils import NormalizedName
+    from poetry.core.packages.dependency import Dependency
     from poetry.poetry import Poetry
 
 
@@ -32,7 +32,9 @@ class Exporter:
 
     FORMAT_CONSTRAINTS_TXT = "constraints.txt"
     FORMAT_REQUIREMENTS_TXT = "requirements.txt"
-    ALLOWED_HASH_ALGORITHMS = ("sha256", "sha384", "sha512")
+    ALLOWED_HASH_ALGORITHMS: ClassVar[frozenset[str]] = frozenset(
+        ("sha256", "sha384", "sha512")
+    )
 
     EXPORT_METHODS: ClassVar[dict[str, str]] = {
         FORMAT_CONSTRAINTS_TXT: "_export_constraints_txt",
@@ -86,10 +88,7 @@ class Exporter:
     def _export_generic_txt(
         self, cwd: Path, output: IO | str, with_extras: bool, allow_editable: bool
     ) -> None:
-        from poetry.core.packages.utils.utils import path_to_url
-
         indexes = set()
-        content = ""
         dependency_lines = set()
 
         python_marker = parse_marker(
@@ -116,10 +115,12 @@ class Exporter:
                 extras=self._extras,
             )
 
+        with_hashes = self._with_hashes
+        with_urls = self._with_urls
+        allowed_hash_algorithms = self.ALLOWED_HASH_ALGORITHMS
         for dependency_package in dependency_package_iterator:
-            line = ""
-
-            if not with_extras:
+            # without_features() clones the package, only do it if there are any
+            if not with_extras and dependency_package.package.features:
                 dependency_package = dependency_package.without_features()
 
             dependency = dependency_package.dependency
@@ -133,97 +134,110 @@ class Exporter:
                 )
                 continue
 
-            requirement = dependency.to_pep_508(with_extras=False, resolved=True)
             is_direct_local_reference = (
                 dependency.is_file() or dependency.is_directory()
             )
             is_direct_remote_reference = dependency.is_vcs() or dependency.is_url()
 
+            parts: list[str] = []
             if is_direct_remote_reference:
-                line = requirement
+                parts.append(dependency.to_pep_508(with_extras=False, resolved=True))
             elif is_direct_local_reference:
                 assert dependency.source_url is not None
                 dependency_uri = path_to_url(dependency.source_url)
                 if package.develop:
-                    line = f"-e {dependency_uri}"
+                    parts.append(f"-e {dependency_uri}")
                 else:
-                    line = f"{package.complete_name} @ {dependency_uri}"
+                    parts.append(f"{package.complete_name} @ {dependency_uri}")
             else:
-                line = f"{package.complete_name}=={package.version}"
+                parts.append(f"{package.complete_name}=={package.version}")
 
-            if not is_direct_remote_reference and ";" in requirement:
-                markers = requirement.split(";", 1)[1].strip()
+            if not is_direct_remote_reference:
+                markers = self._requirement_markers(dependency)
                 if markers:
-                    line += f" ; {markers}"
+                    parts.append(f" ; {markers}")
 
             if (
-                not is_direct_remote_reference
+                with_urls
+                and not is_direct_remote_reference
                 and not is_direct_local_reference
-                and package.source_url
+                and (source_url := package.source_url)
             ):
-                indexes.add(package.source_url.rstrip("/"))
-
-            if package.files and self._with_hashes:
-                hashes = []
-                for f in package.files:
-                    h = f["hash"]
-                    algorithm = "sha256"
-                    if ":" in h:
-                        algorithm, h = h.split(":")
-
-                        if algorithm not in self.ALLOWED_HASH_ALGORITHMS:
-                            continue
-
-                    hashes.append(f"{algorithm}:{h}")
-
-                hashes.sort()
-
-                for h in hashes:
-                    line += f" \\\n    --hash={h}"
+                indexes.add(source_url.rstrip("/"))
+
+            if with_hashes and package.files:
+                # Hashes without an algorithm prefix are sha256
+                hashes = sorted(
+                    f"{algorithm}:{h}" if sep else f"sha256:{algorithm}"
+                    for algorithm, sep, h in (
+                        f["hash"].partition(":") for f in package.files
+                    )
+                    if not sep or algorithm in allowed_hash_algorithms
+                )
+                if hashes:
+                    parts.append(" \\\n    --hash=")
+                    parts.append(" \\\n    --hash=".join(hashes))
 
+            line = "".join(parts)
             dependency_lines.add(line)
 
-        content += "\n".join(sorted(dependency_lines))
-        content += "\n"
+        content = ["\n".join(sorted(dependency_lines)), "\n"]
 
-        if indexes and self._with_urls:
+        if indexes:
             # If we have extra indexes, we add them to the beginning of the output
-            indexes_header = ""
-            has_pypi_repository = any(
-                r.name.lower() == "pypi" for r in self._poetry.pool.all_repositories
-            )
+            indexes_header: list[str] = []
+            # The pool re-sorts its repositories on every access, so look them up once
+            pool = self._poetry.pool
+            has_pypi_repository = False
             # Iterate over repositories so that we get the repository with the highest
             # priority first so that --index-url comes before --extra-index-url
-            for repository in self._poetry.pool.all_repositories:
-                if (
-                    not isinstance(repository, HTTPRepository)
-                    or repository.url not in indexes
-                ):
-                    continue
-
+            index_repositories: list[HTTPRepository] = []
+            for repository in pool.all_repositories:
+                if repository.name.lower() == "pypi":
+                    has_pypi_repository = True
+                if isinstance(repository, HTTPRepository) and repository.url in indexes:
+                    index_repositories.append(repository)
+
+            default_repository = None
+            if not has_pypi_repository and (repositories := pool.repositories):
+                default_repository = repositories[0]
+            with_credentials = self._with_credentials
+            for repository in index_repositories:
                 url = (
-                    repository.authenticated_url
-                    if self._with_credentials
-                    else repository.url
+                    repository.authenticated_url if with_credentials else repository.url
                 )
-                parsed_url = urllib.parse.urlsplit(url)
-                if parsed_url.scheme == "http":
-                    indexes_header += f"--trusted-host {parsed_url.netloc}\n"
-                if (
-                    not has_pypi_repository
-                    and repository is self._poetry.pool.repositories[0]
-                ):
-                    indexes_header += f"--index-url {url}\n"
+                scheme, _, location = url.partition("://")
+                if scheme.lower() == "http":
+                    netloc = location.partition("/")[0]
+                    indexes_header.append(f"--trusted-host {netloc}\n")
+                if repository is default_repository:
+                    indexes_header.append(f"--index-url {url}\n")
                 else:
-                    indexes_header += f"--extra-index-url {url}\n"
+                    indexes_header.append(f"--extra-index-url {url}\n")
 
-            content = indexes_header + "\n" + content
+            content = [*indexes_header, "\n", *content]
 
         if isinstance(output, IO):
-            output.write(content)
+            output.write("".join(content))
         else:
             with (cwd / output).open("w", encoding="utf-8") as txt:
-                txt.write(content)
+                txt.writelines(content)
+
+    @staticmethod
+    def _requirement_markers(dependency: Dependency) -> str:
+        # Same markers as Dependency.to_pep_508(with_extras=False) would render,
+        # without building and re-splitting the whole requirement string.
+        if dependency.marker.is_any():
+            if dependency.python_versions == "*":
+                return ""
+
+            return create_nested_marker("python_version", dependency.python_constraint)
+
+        marker = dependency.marker.without_extras()
+        if marker.is_empty() or marker.is_any():
+            return ""
+
+        return str(marker)
 
     _export_constraints_txt = partialmethod(
         _export_generic_txt, with_extras=False, allow_editable=False
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from collections import deque
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from packaging.utils import canonicalize_name
@@ -16,11 +19,14 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from packaging.utils import NormalizedName
+    from poetry.core.constraints.version import VersionConstraint
     from poetry.core.packages.dependency import Dependency
     from poetry.core.packages.package import Package
     from poetry.core.version.markers import BaseMarker
     from poetry.packages import Locker
 
+    CandidatesKey = tuple[NormalizedName, VersionConstraint, VersionConstraint]
+
 
 def get_python_version_region_markers(packages: list[Package]) -> list[BaseMarker]:
     markers = []
@@ -56,29 +62,29 @@ def get_project_dependency_packages(
     project_python_marker: BaseMarker | None = None,
     extras: Collection[NormalizedName] = (),
 ) -> Iterator[DependencyPackage]:
-    # Apply the project python marker to all requirements.
-    if project_python_marker is not None:
-        marked_requires: list[Dependency] = []
-        for require in project_requires:
-            require = require.clone()
-            require.marker = require.marker.intersect(project_python_marker)
-            marked_requires.append(require)
-        project_requires = marked_requires
+    # Nothing to walk, so avoid loading the locked repository at all.
+    if not project_requires:
+        return
+
+    if project_python_marker is not None and project_python_marker.is_any():
+        project_python_marker = None
 
     repository = locker.locked_repository()
 
     # Build a set of all packages required by our selected extras
-    locked_extras = {
-        canonicalize_name(extra): [
-            canonicalize_name(dependency) for dependency in dependencies
-        ]
-        for extra, dependencies in locker.lock_data.get("extras", {}).items()
-    }
-    extra_package_names = get_extra_package_names(
-        repository.packages,
-        locked_extras,
-        extras,
-    )
+    extra_package_names: set[NormalizedName] = set()
+    if extras:
+        locked_extras = {
+            canonicalize_name(extra): [
+                canonicalize_name(dependency) for dependency in dependencies
+            ]
+            for extra, dependencies in locker.lock_data.get("extras", {}).items()
+        }
+        extra_package_names = get_extra_package_names(
+            repository.packages,
+            locked_extras,
+            extras,
+        )
 
     # If a package is optional and we haven't opted in to it, do not select
     selected = []
@@ -92,6 +98,11 @@ def get_project_dependency_packages(
             # a package is locked as optional, but is not activated via extras
             continue
 
+        # Apply the project python marker to all selected requirements.
+        if project_python_marker is not None:
+            dependency = dependency.clone()
+            dependency.marker = dependency.marker.intersect(project_python_marker)
+
         selected.append(dependency)
 
     for package, dependency in get_project_dependencies(
@@ -109,18 +120,13 @@ def get_project_dependencies(
 ) -> Iterable[tuple[Package, Dependency]]:
     # group packages entries by name, this is required because requirement might use
     # different constraints.
-    packages_by_name: dict[str, list[Package]] = {}
+    packages_by_name: dict[str, list[Package]] = defaultdict(list)
     for pkg in locked_packages:
-        if pkg.name not in packages_by_name:
-            packages_by_name[pkg.name] = []
         packages_by_name[pkg.name].append(pkg)
 
     # Put higher versions first so that we prefer them.
     for packages in packages_by_name.values():
-        packages.sort(
-            key=lambda package: package.version,
-            reverse=True,
-        )
+        packages.sort(key=attrgetter("version"), reverse=True)
 
     nested_dependencies = walk_dependencies(
         dependencies=project_requires,
@@ -137,10 +143,12 @@ def walk_dependencies(
     root_package_name: NormalizedName,
 ) -> dict[Package, Dependency]:
     nested_dependencies: dict[Package, Dependency] = {}
+    compatible_candidates: dict[CandidatesKey, list[Package]] = {}
 
+    pending = deque(dependencies)
     visited: set[tuple[Dependency, BaseMarker]] = set()
-    while dependencies:
-        requirement = dependencies.pop(0)
+    while pending:
+        requirement = pending.popleft()
         if (requirement, requirement.marker) in visited:
             continue
         if requirement.name == root_package_name:
@@ -148,7 +156,7 @@ def walk_dependencies(
         visited.add((requirement, requirement.marker))
 
         locked_package = get_locked_package(
-            requirement, packages_by_name, nested_dependencies
+            requirement, packages_by_name, nested_dependencies, compatible_candidates
         )
 
         if not locked_package:
@@ -162,15 +170,22 @@ def walk_dependencies(
         constraint = requirement.constraint
         marker = requirement.marker
         requirement = locked_package.to_dependency()
-        requirement.marker = requirement.marker.intersect(marker)
+        if not marker.is_any():
+            requirement.marker = requirement.marker.intersect(marker)
 
         requirement.constraint = constraint
 
-        for require in locked_package.requires:
-            if require.is_optional() and not any(
-                require in locked_package.extras.get(feature, ())
-                for feature in locked_package.features
-            ):
+        # the markers of all nested requirements would be empty as well
+        requires = [] if requirement.marker.is_empty() else locked_package.requires
+
+        # optional requirements are only followed if an active feature requires them
+        feature_requires = {
+            dependency
+            for feature in locked_package.features
+            for dependency in locked_package.extras.get(feature, ())
+        }
+        for require in requires:
+            if require.is_optional() and require not in feature_requires:
                 continue
 
             base_marker = require.marker.intersect(requirement.marker).without_extras()
@@ -189,7 +204,7 @@ def walk_dependencies(
                     if not marker.is_empty():
                         require2 = require.clone()
                         require2.marker = marker
-                        dependencies.append(require2)
+                        pending.append(require2)
 
         key = locked_package
         if key not in nested_dependencies:
@@ -206,10 +221,15 @@ def get_locked_package(
     dependency: Dependency,
     packages_by_name: dict[str, list[Package]],
     decided: dict[Package, Dependency] | None = None,
+    compatible_candidates_cache: dict[CandidatesKey, list[Package]] | None = None,
 ) -> Package | None:
     """
     Internal helper to identify corresponding locked package using dependency
     version constraints.
+
+    Compatible candidates of dependencies without a direct source only depend on
+    the name and the constraints, so they are remembered in
+    compatible_candidates_cache if given.
     """
     decided = decided or {}
 
@@ -232,13 +252,15 @@ def get_locked_package(
         return None
 
     # Get the packages that are consistent with this dependency.
-    compatible_candidates = [
-        package
-        for package in candidates
-        if package.python_constraint.allows_all(dependency.python_constraint)
-        and dependency.constraint.allows(package.version)
-        and (dependency.source_type is None or dependency.is_same_source_as(package))
-    ]
+    if compatible_candidates_cache is None or dependency.source_type is not None:
+        compatible_candidates = get_compatible_candidates(dependency, candidates)
+    else:
+        key = (dependency.name, dependency.constraint, dependency.python_constraint)
+        if key not in compatible_candidates_cache:
+            compatible_candidates_cache[key] = get_compatible_candidates(
+                dependency, candidates
+            )
+        compatible_candidates = compatible_candidates_cache[key]
 
     # If we have an overlapping candidate, we must use it.
     if overlapping_candidates:
@@ -264,6 +286,21 @@ def get_locked_package(
     return next(iter(compatible_candidates), None)
 
 
+def get_compatible_candidates(
+    dependency: Dependency, candidates: list[Package]
+) -> list[Package]:
+    # Check the version first, it is much cheaper than comparing python constraints.
+    allows_version = dependency.constraint.allows
+    python_constraint = dependency.python_constraint
+    return [
+        package
+        for package in candidates
+        if allows_version(package.version)
+        and package.python_constraint.allows_all(python_constraint)
+        and (dependency.source_type is None or dependency.is_same_source_as(package))
+    ]
+
+
 def get_project_dependency_packages2(
     locker: Locker,
     project_python_marker: BaseMarker | None = None,
@@ -88,7 +88,7 @@ def config(
     return c
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fixture_root() -> Path:
     return Path(__file__).parent / "fixtures"
 
@@ -80,6 +80,11 @@ class TestExecutor(Executor):
         self._installs: list[Package] = []
         self._updates: list[Package] = []
         self._uninstalls: list[Package] = []
+        self._packages_by_job_type = {
+            "install": self._installs,
+            "update": self._updates,
+            "uninstall": self._uninstalls,
+        }
 
     @property
     def installations(self) -> list[Package]:
@@ -97,7 +102,7 @@ class TestExecutor(Executor):
         super()._do_execute_operation(operation)
 
         if not operation.skipped:
-            getattr(self, f"_{operation.job_type}s").append(operation.package)
+            self._packages_by_job_type[operation.job_type].append(operation.package)
 
         return 0
 
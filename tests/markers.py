@@ -25,6 +25,7 @@ MARKER_PY362_PY40 = parse_marker(
     'python_full_version >= "3.6.2" and python_version < "4.0"'
 )
 MARKER_PY36_ONLY = parse_marker('python_version == "3.6"')
+MARKER_PY27_PY36_ONLY = MarkerUnion(MARKER_PY27, MARKER_PY36_ONLY)
 
 MARKER_PY37 = parse_marker('python_version >= "3.7" and python_version < "4.0"')
 
@@ -34,3 +35,6 @@ MARKER_PY_WIN32 = MARKER_PY.intersect(MARKER_WIN32)
 MARKER_PY_WINDOWS = MARKER_PY.intersect(MARKER_WINDOWS)
 MARKER_PY_LINUX = MARKER_PY.intersect(MARKER_LINUX)
 MARKER_PY_DARWIN = MARKER_PY.intersect(MARKER_DARWIN)
+
+MARKER_PY_UNION_LINUX = MARKER_PY.union(MARKER_PY_LINUX)
+MARKER_PY_UNION_DARWIN = MARKER_PY.union(MARKER_PY_DARWIN)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import pytest
 
 from packaging.utils import NormalizedName
@@ -7,9 +9,14 @@ from poetry.core.packages.dependency import Dependency
 from poetry.core.packages.package import Package
 
 from poetry_plugin_export.walker import DependencyWalkerError
+from poetry_plugin_export.walker import get_project_dependency_packages
 from poetry_plugin_export.walker import walk_dependencies
 
 
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
 def test_walk_dependencies_multiple_versions_when_latest_is_not_compatible() -> None:
     # TODO: Support this case:
     # https://github.com/python-poetry/poetry-plugin-export/issues/183
@@ -25,3 +32,18 @@ def test_walk_dependencies_multiple_versions_when_latest_is_not_compatible() ->
             },
             root_package_name=NormalizedName("package-name"),
         )
+
+
+def test_get_project_dependency_packages_without_requires(
+    mocker: MockerFixture,
+) -> None:
+    locker = mocker.Mock()
+
+    packages = get_project_dependency_packages(
+        locker,
+        project_requires=[],
+        root_package_name=NormalizedName("package-name"),
+    )
+
+    assert list(packages) == []
+    locker.locked_repository.assert_not_called()